@@ -14,31 +14,46 @@
 """Perform assembly based on debruijn graph."""
 
 import argparse
+import gzip
+import mmap
 import os
 import sys
+from multiprocessing import Pool
 from pathlib import Path
 from networkx import (
     DiGraph,
+    NetworkXUnfeasible,
     all_simple_paths,
     lowest_common_ancestor,
-    has_path,
     random_layout,
     draw,
     spring_layout,
+    topological_sort,
 )
 import matplotlib
 from operator import itemgetter
 import random
 
 random.seed(9001)
+from collections import Counter
 from random import randint
-import statistics
 import textwrap
 import matplotlib.pyplot as plt
 from typing import Iterator, Dict, List
 
 matplotlib.use("Agg")
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    from numba import njit, types as numba_types
+    from numba.typed import Dict as NumbaDict
+except ImportError:
+    njit = None
+
 __author__ = "Your Name"
 __copyright__ = "Universite Paris Diderot"
 __credits__ = ["Your Name"]
@@ -96,24 +111,242 @@ def get_arguments():  # pragma: no cover
     return parser.parse_args()
 
 
+# 2-bit nucleotide encoding (A=00, C=01, G=10, T=11), upper or lower case.
+# The full 256-entry table makes sequence.translate(_NUC_LUT) a single
+# branchless C pass over the read; bytes outside ACGT/acgt (e.g. 'N') map to
+# the 0xFF sentinel and reset the rolling window.
+_NUC_LUT = bytes(b"ACGT".find(bytes([byte]).upper()) & 0xFF for byte in range(256))
+
+
+if njit is not None:  # pragma: no cover
+    _NUC_LUT_ARRAY = np.frombuffer(_NUC_LUT, dtype=np.uint8)
+
+    @njit(cache=True)
+    def _count_codes_njit(sequence, kmer_size, code_counts, canonical):
+        """Count the packed kmer codes of a read into a typed dict.
+
+        Machine-code version of the rolling 2-bit encoder: translation,
+        shift-and-mask and the dict increment all run without interpreter
+        dispatch. The reverse complement is maintained as a second rolling
+        code, so canonical counting stays O(1) per base. The typed dict is
+        reused across reads by the caller. Only valid for kmer_size up to
+        _NJIT_K_MAX: the mask overflows int64 beyond that.
+
+        :param sequence: (np.ndarray) Read bytes as a uint8 array.
+        :param kmer_size: (int) Length of the kmers.
+        :param code_counts: (numba.typed.Dict) int64 -> int64 counts.
+        :param canonical: (bool) Count each kmer and its reverse complement
+            as one entity.
+        """
+        mask = (1 << (2 * kmer_size)) - 1
+        shift = 2 * (kmer_size - 1)
+        code = 0
+        reverse = 0
+        valid = 0
+        for base in sequence:
+            value = np.int64(_NUC_LUT_ARRAY[base])
+            if value == 0xFF:
+                valid = 0
+                continue
+            code = ((code << 2) | value) & mask
+            reverse = (reverse >> 2) | ((value ^ 3) << shift)
+            valid += 1
+            if valid >= kmer_size:
+                key = min(code, reverse) if canonical else code
+                if key in code_counts:
+                    code_counts[key] += 1
+                else:
+                    code_counts[key] = 1
+
+
+def _encode_kmer(kmer: str) -> int:
+    """Pack a kmer string into its 2-bit integer encoding.
+
+    :param kmer: (str) A kmer made of ACGT characters.
+    :return: (int) The 2-bit packed encoding of the kmer.
+    """
+    code = 0
+    for base in kmer.encode().translate(_NUC_LUT):
+        code = (code << 2) | base
+    return code
+
+
+def _reverse_complement_code(code: int, kmer_size: int) -> int:
+    """Compute the reverse complement of a 2-bit packed kmer code.
+
+    On the packed encoding the complement is a XOR with 0b11 (A<->T, C<->G)
+    and the reversal a 2-bit group swap, so no string round trip is needed.
+
+    :param code: (int) The 2-bit packed encoding of a kmer.
+    :param kmer_size: (int) Length of the kmer.
+    :return: (int) The packed encoding of the reverse complement.
+    """
+    reverse = 0
+    for _ in range(kmer_size):
+        reverse = (reverse << 2) | ((code & 3) ^ 3)
+        code >>= 2
+    return reverse
+
+
+def _decode_kmer(code: int, kmer_size: int) -> str:
+    """Unpack a 2-bit integer encoding back into a kmer string.
+
+    :param code: (int) The 2-bit packed encoding of a kmer.
+    :param kmer_size: (int) Length of the kmer.
+    :return: (str) The kmer string.
+    """
+    return "".join(
+        "ACGT"[(code >> (2 * (kmer_size - 1 - i))) & 3] for i in range(kmer_size)
+    )
+
+
+def _rolling_codes(sequence: bytes, kmer_size: int) -> Iterator[int]:
+    """Yield the 2-bit packed code of every kmer of a read.
+
+    The code is updated in O(1) per base with a rolling shift-and-mask
+    instead of hashing a k-character substring at every position. A non-ACGT
+    base (e.g. 'N') resets the window so no kmer spanning it is emitted.
+
+    :param sequence: (bytes) Sequence of a read.
+    :param kmer_size: (int) Length of the kmers.
+    :return: A generator object that provides the packed codes (int).
+    """
+    mask = (1 << (2 * kmer_size)) - 1
+    code = 0
+    valid = 0
+    for base in sequence.translate(_NUC_LUT):
+        if base == 0xFF:
+            valid = 0
+            continue
+        code = ((code << 2) | base) & mask
+        valid += 1
+        if valid >= kmer_size:
+            yield code
+
+
+# 32 bases fill the uint64 words of the vectorized paths; larger kmers must
+# go through the arbitrary-precision Python int encoder (_rolling_codes).
+# The Numba kernel computes on signed int64, where the k=32 mask already
+# overflows, so it stops one base earlier.
+_PACK_K_MAX = 32
+_NJIT_K_MAX = 31
+
+
+def _vector_codes(sequence: bytes, kmer_size: int):
+    """Compute the packed codes of every kmer of a read with NumPy.
+
+    The translated read becomes a uint8 array and the codes of all windows
+    are built with kmer_size vectorized shift-or passes, moving the inner
+    loop from interpreted Python to C. Windows spanning a non-ACGT base are
+    dropped via a cumulative-sum range check. Only valid for kmer_size up
+    to _PACK_K_MAX: beyond that the leading bases shift out of the uint64.
+
+    :param sequence: (bytes) Sequence of a read.
+    :param kmer_size: (int) Length of the kmers.
+    :return: (np.ndarray) The packed codes (uint64) of the valid kmers.
+    """
+    encoded = np.frombuffer(sequence.translate(_NUC_LUT), dtype=np.uint8)
+    n_windows = encoded.size - kmer_size + 1
+    if n_windows <= 0:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.zeros(n_windows, dtype=np.uint64)
+    for offset in range(kmer_size):
+        codes = (codes << np.uint64(2)) | encoded[offset : offset + n_windows]
+    invalid = np.cumsum(encoded == 0xFF)
+    spans_invalid = invalid[kmer_size - 1 :] - np.concatenate(
+        ([0], invalid[:-kmer_size])
+    )
+    return codes[spans_invalid == 0]
+
+
+def _canonical_codes(codes, kmer_size: int):
+    """Reduce an array of packed codes to their canonical representation.
+
+    The reverse complements are computed with kmer_size vectorized
+    shift/xor passes, then each code is replaced by the smaller of itself
+    and its reverse complement. Like _vector_codes, only valid for
+    kmer_size up to _PACK_K_MAX.
+
+    :param codes: (np.ndarray) Packed codes (uint64) of the kmers.
+    :param kmer_size: (int) Length of the kmers.
+    :return: (np.ndarray) The canonical packed codes (uint64).
+    """
+    reverse = np.zeros_like(codes)
+    remaining = codes
+    for _ in range(kmer_size):
+        reverse = (reverse << np.uint64(2)) | ((remaining & np.uint64(3)) ^ np.uint64(3))
+        remaining = remaining >> np.uint64(2)
+    return np.minimum(codes, reverse)
+
+
+def _iter_fastq_sequences(buffer, start: int = 0, end: int = None) -> Iterator[bytes]:
+    """Yield the sequence line of every record of an in-memory fastq buffer.
+
+    Record boundaries are located with `buffer.find(b"\\n", ...)`, which runs
+    as a C memchr scan, instead of one readline()/strip() call per line. Only
+    the sequence line is sliced out; header, '+' and quality lines are
+    skipped over.
+
+    :param buffer: (bytes or mmap.mmap) The whole fastq content.
+    :param start: (int) Offset of the first record to scan.
+    :param end: (int) Offset at which to stop scanning (default: buffer end).
+    :return: A generator object that iterate the read sequences (bytes).
+    """
+    size = len(buffer) if end is None else end
+    pos = start
+    while pos < size:
+        header_end = buffer.find(b"\n", pos, size)
+        if header_end == -1:
+            break
+        seq_end = buffer.find(b"\n", header_end + 1, size)
+        if seq_end == -1:
+            seq_end = size
+        # CRLF input: drop the trailing '\r' the strip() of a line-based
+        # reader would have removed.
+        line_end = seq_end
+        if line_end > header_end + 1 and buffer[line_end - 1] == 0x0D:
+            line_end -= 1
+        yield buffer[header_end + 1 : line_end]
+        # Skip the '+' line and the quality line
+        pos = seq_end + 1
+        for _ in range(2):
+            newline = buffer.find(b"\n", pos, size)
+            if newline == -1:
+                return
+            pos = newline + 1
+
+
+def _read_fastq_bytes(fastq_file: Path) -> Iterator[bytes]:
+    """Extract reads from fastq files as raw bytes.
+
+    Plain files are memory-mapped and scanned in bulk; gzipped files
+    (.gz extension) are decompressed once and scanned the same way. Yielding
+    bytes lets the k-mer counting path work on a single contiguous buffer
+    per read without any str decoding or per-kmer allocation.
+
+    :param fastq_file: (Path) Path to the fastq file.
+    :return: A generator object that iterate the read sequences (bytes).
+    """
+    if str(fastq_file).endswith(".gz"):
+        with gzip.open(fastq_file, "rb") as file:
+            buffer = file.read()
+        yield from _iter_fastq_sequences(buffer)
+        return
+    with open(fastq_file, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _iter_fastq_sequences(buffer)
+
+
 def read_fastq(fastq_file: Path) -> Iterator[str]:
     """Extract reads from fastq files.
 
     :param fastq_file: (Path) Path to the fastq file.
     :return: A generator object that iterate the read sequences.
     """
-    with open(fastq_file, 'r') as file:
-        while True:
-            # Read the 4 lines of each FASTQ entry
-            identifier = file.readline().strip()
-            if not identifier:  # End of file
-                break
-            sequence = file.readline().strip()
-            file.readline()  # Skip the '+' line
-            file.readline()  # Skip the quality score line
-            
-            yield sequence 
-    pass
+    for sequence in _read_fastq_bytes(fastq_file):
+        yield sequence.decode("ascii")
 
 
 def cut_kmer(read: str, kmer_size: int) -> Iterator[str]:
@@ -128,40 +361,291 @@ def cut_kmer(read: str, kmer_size: int) -> Iterator[str]:
   
     pass
 
-def build_kmer_dict(fastq_file: Path, kmer_size: int) -> Dict[str, int]:
-    """Build a dictionnary object of all kmer occurrences in the fastq file
+# Largest kmer size counted through a dense table: 4^12 int64 counts are
+# ~134 MiB, one flat histogram with no hashing at all.
+_DENSE_K_MAX = 12
 
-    :param fastq_file: (str) Path to the fastq file.
-    :return: A dictionnary object that identify all kmer occurrences.
+
+def _count_reads(reads, kmer_size: int, canonical: bool = False) -> Dict[int, int]:
+    """Count the packed kmer codes of an iterable of reads.
+
+    For small kmers (4^k entries fit comfortably in memory) the counts are
+    a single np.bincount over the concatenated codes — a pure vectorized
+    histogram, no hash table. Otherwise a sparse dict strategy is picked:
+    the Numba kernel if available, else Counter.update, which goes through
+    the C-accelerated _count_elements helper, one dict probe per element
+    instead of a membership check plus an increment.
+
+    :param reads: An iterable of read sequences (bytes).
+    :param kmer_size: (int) Length of the kmers.
+    :param canonical: (bool) Count each kmer and its reverse complement as
+        one entity, keyed by the smaller packed code.
+    :return: (dict) A dictionnary mapping packed codes to occurrence counts.
+    """
+    if np is not None and kmer_size <= _DENSE_K_MAX:
+        code_arrays = []
+        for read in reads:
+            codes = _vector_codes(read, kmer_size)
+            if canonical:
+                codes = _canonical_codes(codes, kmer_size)
+            code_arrays.append(codes)
+        if not code_arrays:
+            return {}
+        counts = np.bincount(
+            np.concatenate(code_arrays), minlength=4**kmer_size
+        )
+        nonzero = np.flatnonzero(counts)
+        return dict(zip(nonzero.tolist(), counts[nonzero].tolist()))
+    if njit is not None and kmer_size <= _NJIT_K_MAX:  # pragma: no cover
+        typed_counts = NumbaDict.empty(numba_types.int64, numba_types.int64)
+        for read in reads:
+            _count_codes_njit(
+                np.frombuffer(read, dtype=np.uint8), kmer_size, typed_counts, canonical
+            )
+        return {int(code): int(count) for code, count in typed_counts.items()}
+    code_counts = Counter()
+    if np is not None and kmer_size <= _PACK_K_MAX:
+        for read in reads:
+            codes = _vector_codes(read, kmer_size)
+            if canonical:
+                codes = _canonical_codes(codes, kmer_size)
+            # Collapse the read's duplicates in C first: one global dict
+            # write per distinct code instead of one per occurrence.
+            uniq, counts = np.unique(codes, return_counts=True)
+            code_counts.update(dict(zip(uniq.tolist(), counts.tolist())))
+    elif canonical:
+        for read in reads:
+            code_counts.update(
+                min(code, _reverse_complement_code(code, kmer_size))
+                for code in _rolling_codes(read, kmer_size)
+            )
+    else:
+        for read in reads:
+            code_counts.update(_rolling_codes(read, kmer_size))
+    return code_counts
+
+
+# Bloom filter size (bits) of the singleton pre-pass; power of two so the
+# modulo is a mask. 2^27 bits = 16 MiB.
+_BLOOM_BITS = 1 << 27
+
+
+def _bloom_positions(code: int) -> tuple:
+    """Derive the two Bloom filter bit positions of a packed kmer code.
+
+    :param code: (int) The 2-bit packed encoding of a kmer.
+    :return: (tuple) Two bit indices in [0, _BLOOM_BITS).
+    """
+    mixed = (code * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    return mixed & (_BLOOM_BITS - 1), (mixed >> 32) & (_BLOOM_BITS - 1)
+
+
+def _iter_read_codes(read: bytes, kmer_size: int, canonical: bool = False):
+    """Iterate the packed (optionally canonical) codes of a single read.
+
+    :param read: (bytes) Sequence of a read.
+    :param kmer_size: (int) Length of the kmers.
+    :param canonical: (bool) Map each code to its canonical representation.
+    :return: An iterable of packed codes (int).
     """
+    if np is not None and kmer_size <= _PACK_K_MAX:
+        codes = _vector_codes(read, kmer_size)
+        if canonical:
+            codes = _canonical_codes(codes, kmer_size)
+        return codes.tolist()
+    if canonical:
+        return (
+            min(code, _reverse_complement_code(code, kmer_size))
+            for code in _rolling_codes(read, kmer_size)
+        )
+    return _rolling_codes(read, kmer_size)
+
+
+def _count_repeated_codes(
+    fastq_file: Path, kmer_size: int, canonical: bool = False
+) -> Dict[int, int]:
+    """Count kmers occurring at least twice, Bloom-filtering singletons out.
+
+    Two passes in the style of the HipMer counters: the first pass marks
+    every kmer in a fixed-size Bloom filter and promotes those seen again to
+    the counting dict; the second pass computes exact counts for the
+    promoted kmers only. Error kmers — the bulk of distinct kmers in real
+    data — thus never enter the dict; the rare Bloom false positives only
+    let a few singletons through, with exact counts.
 
-    kmer_dict = {}
-    for read in read_fastq(fastq_file):
-        for kmer in cut_kmer(read, kmer_size):
-            if kmer in kmer_dict:
-                kmer_dict[kmer] += 1
+    :param fastq_file: (Path) Path to the fastq file.
+    :param kmer_size: (int) Length of the kmers.
+    :param canonical: (bool) Count canonical kmers.
+    :return: (dict) A dictionnary mapping packed codes to occurrence counts.
+    """
+    bloom = bytearray(_BLOOM_BITS // 8)
+    code_counts: Dict[int, int] = {}
+    for read in _read_fastq_bytes(fastq_file):
+        for code in _iter_read_codes(read, kmer_size, canonical):
+            if code in code_counts:
+                continue
+            bit_1, bit_2 = _bloom_positions(code)
+            if (bloom[bit_1 >> 3] >> (bit_1 & 7)) & 1 and (
+                bloom[bit_2 >> 3] >> (bit_2 & 7)
+            ) & 1:
+                code_counts[code] = 0
             else:
-                kmer_dict[kmer] = 1
-    return kmer_dict
+                bloom[bit_1 >> 3] |= 1 << (bit_1 & 7)
+                bloom[bit_2 >> 3] |= 1 << (bit_2 & 7)
+    for read in _read_fastq_bytes(fastq_file):
+        for code in _iter_read_codes(read, kmer_size, canonical):
+            count = code_counts.get(code)
+            if count is not None:
+                code_counts[code] = count + 1
+    return code_counts
+
+
+def _align_to_record(buffer, pos: int, end: int) -> int:
+    """Round an arbitrary offset forward to the next fastq record start.
+
+    A record start is a line beginning with '@' whose next-next line begins
+    with '+' — this also steps over quality lines that happen to start
+    with '@'.
+
+    :param buffer: (mmap.mmap) The fastq content.
+    :param pos: (int) Offset to round forward.
+    :param end: (int) Offset past which not to search.
+    :return: (int) Offset of the next record start, or end if none is found.
+    """
+    if pos > 0:
+        newline = buffer.find(b"\n", pos - 1, end)
+        if newline == -1:
+            return end
+        pos = newline + 1
+    while pos < end:
+        line_end = buffer.find(b"\n", pos, end)
+        if line_end == -1:
+            break
+        if buffer[pos] == 0x40:  # '@'
+            next_line_end = buffer.find(b"\n", line_end + 1, end)
+            if next_line_end == -1:
+                break
+            if next_line_end + 1 < end and buffer[next_line_end + 1] == 0x2B:  # '+'
+                return pos
+        pos = line_end + 1
+    return end
 
-    pass
 
+def _fastq_chunk_tasks(
+    fastq_file: Path, kmer_size: int, processes: int, canonical: bool = False
+) -> List:
+    """Split a fastq file into record-aligned byte ranges for the workers.
 
-def build_graph(kmer_dict: Dict[str, int]) -> DiGraph:
+    :param fastq_file: (Path) Path to the fastq file.
+    :param kmer_size: (int) Length of the kmers.
+    :param processes: (int) Number of byte ranges wanted.
+    :param canonical: (bool) Forwarded to the workers.
+    :return: (list) A list of (fastq_file, start, end, kmer_size, canonical)
+        tuples.
+    """
+    with open(fastq_file, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            offsets = sorted(
+                {
+                    _align_to_record(buffer, size * i // processes, size)
+                    for i in range(1, processes)
+                }
+            )
+    edges = [0] + [offset for offset in offsets if 0 < offset < size] + [size]
+    return [
+        (fastq_file, start, end, kmer_size, canonical)
+        for start, end in zip(edges[:-1], edges[1:])
+        if start < end
+    ]
+
+
+def _count_fastq_chunk(task) -> Dict[int, int]:
+    """Count the kmers of one byte range of a fastq file (worker side).
+
+    :param task: (tuple) A (fastq_file, start, end, kmer_size, canonical)
+        tuple.
+    :return: (dict) A dictionnary mapping packed codes to occurrence counts.
+    """
+    fastq_file, start, end, kmer_size, canonical = task
+    with open(fastq_file, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _count_reads(
+                _iter_fastq_sequences(buffer, start, end), kmer_size, canonical
+            )
+
+
+def build_kmer_dict(
+    fastq_file: Path,
+    kmer_size: int,
+    processes: int = 1,
+    canonical: bool = False,
+    drop_singletons: bool = False,
+) -> Dict[str, int]:
+    """Build a dictionnary object of all kmer occurrences in the fastq file
+
+    :param fastq_file: (str) Path to the fastq file.
+    :param kmer_size: (int) Length of the kmers.
+    :param processes: (int) Number of worker processes (default 1: serial).
+    :param canonical: (bool) Merge each kmer with its reverse complement,
+        keeping the lexicographically smaller one — halves the dictionnary
+        for double-stranded data. Leave False when the graph is built from
+        the result, as build_graph expects strand-specific kmers.
+    :param drop_singletons: (bool) Discard kmers seen only once — on real
+        data these are overwhelmingly sequencing errors. Uses a two-pass
+        Bloom filter scheme (serial) so singletons never enter the
+        dictionnary.
+    :return: A dictionnary object that identify all kmer occurrences.
+    """
+    # Count on 2-bit packed integer keys: int hashing is O(1) where string
+    # hashing is O(k), and the counting dict is roughly 8x smaller. Codes are
+    # unpacked to strings only once, at the boundary.
+    if drop_singletons:
+        code_counts = _count_repeated_codes(fastq_file, kmer_size, canonical)
+    elif processes > 1 and not str(fastq_file).endswith(".gz"):
+        # Counting is embarrassingly parallel over reads: each worker counts
+        # one record-aligned byte range and the partial dicts are reduced
+        # here. Gzipped inputs stay serial (no random access in the stream).
+        code_counts = Counter()
+        tasks = _fastq_chunk_tasks(fastq_file, kmer_size, processes, canonical)
+        if tasks:
+            with Pool(min(processes, len(tasks))) as pool:
+                for partial in pool.imap_unordered(_count_fastq_chunk, tasks):
+                    code_counts.update(partial)
+    else:
+        code_counts = _count_reads(_read_fastq_bytes(fastq_file), kmer_size, canonical)
+    return {
+        _decode_kmer(code, kmer_size): count for code, count in code_counts.items()
+    }
+
+
+def build_graph(kmer_dict: Dict[str, int], int_nodes: bool = False) -> DiGraph:
     """Build the debruijn graph
 
     :param kmer_dict: A dictionnary object that identify all kmer occurrences.
+    :param int_nodes: (bool) Intern the (k-1)-mer nodes to small ints and
+        keep their labels in graph.graph["node_labels"]. Every NetworkX
+        lookup then hashes an int in O(1) instead of a (k-1)-character
+        string in O(k), and the adjacency dicts hold small keys.
     :return: A directed graph (nx) of all kmer substring and weight (occurrence).
     """
     graph = DiGraph()
+    if int_nodes:
+        node_ids: Dict[str, int] = {}
+        for kmer, weight in kmer_dict.items():
+            prefix = node_ids.setdefault(kmer[:-1], len(node_ids))
+            suffix = node_ids.setdefault(kmer[1:], len(node_ids))
+            graph.add_edge(prefix, suffix, weight=weight)
+        graph.graph["node_labels"] = list(node_ids)
+        return graph
     for kmer, weight in kmer_dict.items():
         prefix = kmer[:-1]
         suffix = kmer[1:]
-        graph.add_edge(prefix, suffix, weight= weight )
+        graph.add_edge(prefix, suffix, weight=weight)
     return graph
 
-    pass
-
 
 def remove_paths(
     graph: DiGraph,
@@ -185,6 +669,7 @@ def remove_paths(
         end = len(path) if delete_sink_node else len(path) - 1
         for node in path[start:end]:
             graph.remove_node(node)
+    _PATH_WEIGHT_CACHE.clear()
     return graph
 
 
@@ -222,6 +707,33 @@ def select_best_path(
     pass
 
 
+# Memoized path weights, keyed by graph identity and path tuple. Entries are
+# only valid for a given topology, so the cache is cleared after every node
+# removal.
+_PATH_WEIGHT_CACHE: Dict = {}
+
+
+def _path_average_weight_cached(graph: DiGraph, path: List[str]) -> float:
+    """Compute the average weight of a path, memoized per graph and path.
+
+    Identical sub-paths are evaluated repeatedly during bubble and tip
+    simplification; the weight is computed once with a direct edge-dict walk
+    (no subgraph allocation) and reused afterwards.
+
+    :param graph: (nx.DiGraph) A directed graph object
+    :param path: (list) A path consist of a list of nodes
+    :return: (float) The average weight of a path
+    """
+    key = (id(graph), tuple(path))
+    weight = _PATH_WEIGHT_CACHE.get(key)
+    if weight is None:
+        weight = sum(graph[u][v]["weight"] for u, v in zip(path[:-1], path[1:])) / (
+            len(path) - 1
+        )
+        _PATH_WEIGHT_CACHE[key] = weight
+    return weight
+
+
 def path_average_weight(graph: DiGraph, path: List[str]) -> float:
     """Compute the weight of a path
 
@@ -229,9 +741,10 @@ def path_average_weight(graph: DiGraph, path: List[str]) -> float:
     :param path: (list) A path consist of a list of nodes
     :return: (float) The average weight of a path
     """
-    return statistics.mean(
-        [d["weight"] for (u, v, d) in graph.subgraph(path).edges(data=True)]
-    )
+    # Walk the consecutive edges directly instead of materializing the
+    # induced subgraph, which costs a dict-of-dict construction per call.
+    weights = [graph.edges[u, v]["weight"] for u, v in zip(path[:-1], path[1:])]
+    return sum(weights) / len(weights)
 
 
 def solve_bubble(graph: DiGraph, ancestor_node: str, descendant_node: str) -> DiGraph:
@@ -242,37 +755,127 @@ def solve_bubble(graph: DiGraph, ancestor_node: str, descendant_node: str) -> Di
     :param descendant_node: (str) A downstream node in the graph
     :return: (nx.DiGraph) A directed graph object
     """
+    # Restrict the work to the bubble region: nodes reachable forward from
+    # the ancestor that can also reach the descendant.
+    forward = {ancestor_node}
+    queue = [ancestor_node]
+    while queue:
+        for successor in graph.successors(queue.pop()):
+            if successor not in forward:
+                forward.add(successor)
+                queue.append(successor)
+    if descendant_node not in forward:
+        return graph
+    region = {descendant_node}
+    queue = [descendant_node]
+    while queue:
+        for predecessor in graph.predecessors(queue.pop()):
+            if predecessor in forward and predecessor not in region:
+                region.add(predecessor)
+                queue.append(predecessor)
+    internal = region - {ancestor_node, descendant_node}
+    if not internal:
+        return graph
+
+    subgraph = graph.subgraph(region)
+    try:
+        order = list(topological_sort(subgraph))
+    except NetworkXUnfeasible:
+        # The region contains a cycle; fall back to explicit enumeration.
+        return _solve_bubble_enumerate(graph, ancestor_node, descendant_node)
+
+    # Pareto dynamic program over (total weight, edge count). The survivor
+    # must maximize (average weight, length) as everywhere else, and the
+    # average is not additive, so one best prefix per node is not enough.
+    # With positive weights, a prefix beaten on both total (>=) and length
+    # (<=) can never complete to a strictly better average, and equal
+    # averages only arise from identical (total, length) pairs — so keeping
+    # each node's Pareto front of prefixes selects exactly the path the
+    # enumeration would. Real bubbles have near-flat fronts, keeping this
+    # close to O(V+E) instead of exponential.
+    fronts = {ancestor_node: [(0, 0, None, -1)]}
+    for node in order:
+        entries = fronts.get(node)
+        if not entries:
+            continue
+        # Topological order guarantees this front is final: later inserts
+        # only target successors, so the (node, index) back-pointers stored
+        # below stay valid.
+        for successor in subgraph.successors(node):
+            weight = graph.edges[node, successor]["weight"]
+            front = fronts.setdefault(successor, [])
+            for index, (total, length, _, _) in enumerate(entries):
+                _front_insert(front, (total + weight, length + 1, node, index))
+
+    best = max(
+        fronts[descendant_node], key=lambda entry: (entry[0] / entry[1], entry[1])
+    )
+    best_path_nodes = {descendant_node}
+    node, index = best[2], best[3]
+    while node is not None:
+        best_path_nodes.add(node)
+        entry = fronts[node][index]
+        node, index = entry[2], entry[3]
+
+    graph.remove_nodes_from(internal - best_path_nodes)
+    _PATH_WEIGHT_CACHE.clear()
+    return graph
+
+
+def _front_insert(front: List, candidate: tuple) -> None:
+    """Insert a path prefix into a Pareto front, in place.
+
+    An entry dominates another when its total weight is at least as high
+    for at most the same length. Dominated candidates are discarded and an
+    accepted candidate evicts the entries it dominates.
+
+    :param front: (list) The front as (total, length, node, index) entries.
+    :param candidate: (tuple) The (total, length, node, index) entry to add.
+    """
+    total, length = candidate[0], candidate[1]
+    for entry in front:
+        if entry[0] >= total and entry[1] <= length:
+            return
+    front[:] = [
+        entry for entry in front if not (total >= entry[0] and length <= entry[1])
+    ]
+    front.append(candidate)
+
+
+def _solve_bubble_enumerate(
+    graph: DiGraph, ancestor_node: str, descendant_node: str
+) -> DiGraph:
+    """Solve a bubble by enumerating its simple paths.
 
+    Fallback for the rare case where the bubble region is not acyclic and
+    the dynamic program of solve_bubble does not apply.
 
+    :param graph: (nx.DiGraph) A directed graph object
+    :param ancestor_node: (str) An upstream node in the graph
+    :param descendant_node: (str) A downstream node in the graph
+    :return: (nx.DiGraph) A directed graph object
+    """
     paths = list(all_simple_paths(graph, ancestor_node, descendant_node))
-    
-    # If there's only one path or none, return the graph as is
     if len(paths) <= 1:
         return graph
 
-    # Initialize variables to track the best path
     best_path = None
     best_weight = -1
     best_length = -1
-
-    # Evaluate each path based on weight and length
     for path in paths:
-        weight = path_average_weight(graph, path)
+        weight = _path_average_weight_cached(graph, path)
         length = len(path)
-
-        # Determine if this path is better based on criteria
         if (weight > best_weight) or (weight == best_weight and length > best_length):
             best_path = path
             best_weight = weight
             best_length = length
 
-    # Remove all paths except for the best one
     for path in paths:
         if path != best_path:
             graph.remove_nodes_from(path[1:-1])  # Remove intermediate nodes
+    _PATH_WEIGHT_CACHE.clear()
 
     return graph
-    pass
 
 
 def simplify_bubbles(graph: DiGraph) -> DiGraph:
@@ -281,16 +884,29 @@ def simplify_bubbles(graph: DiGraph) -> DiGraph:
     :param graph: (nx.DiGraph) A directed graph object
     :return: (nx.DiGraph) A directed graph object
     """
+    # Snapshot the topology once: the node list and every predecessor list
+    # are frozen up front, so the loop does no repeated adjacency scans and
+    # safely survives the node removals done by solve_bubble. Stale entries
+    # are filtered with cheap membership checks instead.
+    predecessors_map = {
+        node: list(graph.predecessors(node)) for node in graph.nodes()
+    }
     # Create a list to hold nodes that need to be removed
     nodes_to_remove = []
 
-    for node in graph.nodes():
-        predecessors = list(graph.predecessors(node))
-        
+    for node in list(predecessors_map):
+        if node not in graph:
+            continue
+        predecessors = [
+            predecessor
+            for predecessor in predecessors_map[node]
+            if graph.has_edge(predecessor, node)
+        ]
+
         # Check if the node has multiple predecessors
         if len(predecessors) > 1:
-            # Find the lowest common ancestor of all predecessors
-            lca = lowest_common_ancestor(graph, *predecessors)
+            # Find the lowest common ancestor of the first two predecessors
+            lca = lowest_common_ancestor(graph, predecessors[0], predecessors[1])
             if lca is not None:
                 # If an LCA exists, solve the bubble using this node
                 for predecessor in predecessors:
@@ -300,7 +916,9 @@ def simplify_bubbles(graph: DiGraph) -> DiGraph:
                 # After processing, we can also check if we need to remove any edges
                 paths = list(all_simple_paths(graph, lca, node))
                 if paths:
-                    best_path = max(paths, key=lambda p: path_average_weight(graph, p))
+                    best_path = max(
+                        paths, key=lambda p: _path_average_weight_cached(graph, p)
+                    )
                     for path in paths:
                         if path != best_path:
                             # Mark intermediate nodes for removal
@@ -308,9 +926,9 @@ def simplify_bubbles(graph: DiGraph) -> DiGraph:
 
     # Remove marked nodes from the graph after iteration
     graph.remove_nodes_from(set(nodes_to_remove))
+    _PATH_WEIGHT_CACHE.clear()
 
     return graph
-    pass
 
 
 def solve_entry_tips(graph: DiGraph, starting_nodes: List[str]) -> DiGraph:
@@ -320,38 +938,55 @@ def solve_entry_tips(graph: DiGraph, starting_nodes: List[str]) -> DiGraph:
     :param starting_nodes: (list) A list of starting nodes
     :return: (nx.DiGraph)  A directed graph object
     """
-
-    # Create a list to hold nodes that need to be removed
-    nodes_to_remove = []
-
-    for node in starting_nodes:
-        successors = list(graph.successors(node))
-        
-        # If the node has exactly one successor, check its predecessors
-        if len(successors) == 1:
-            successor = successors[0]
-            predecessors = list(graph.predecessors(successor))
-            
-            # If the successor has multiple predecessors, we have an entry tip
-            if len(predecessors) > 1:
-                # Identify the best path from the node to its successor
-                paths = list(all_simple_paths(graph, node, successor))
-                if paths:
-                    # Calculate the average weights for each path
-                    path_weights = [path_average_weight(graph, path) for path in paths]
-                    best_path_index = path_weights.index(max(path_weights))
-                    best_path = paths[best_path_index]
-
-                    # Mark all other paths for removal
-                    for path in paths:
-                        if path != best_path:
-                            nodes_to_remove.extend(path[1:-1])  # Remove intermediate nodes
-
-    # Remove marked nodes from the graph after iteration
-    graph.remove_nodes_from(set(nodes_to_remove))
-
-    return graph       
-    pass
+    # Resolve each join locally: every incoming branch is walked backward
+    # along its linear chain and the branches compete on (average weight,
+    # length) as soon as one of them hangs off an entry tip. Each pass is
+    # O(V + E) — no per-join path enumeration from every starting node —
+    # and the while loop replaces the old tail recursion, which pushed one
+    # stack frame per removal round. Removals are deferred to the end of
+    # the pass, as in simplify_bubbles, so every chain walk sees the same
+    # graph and chains do not merge behind the scan.
+    tips = set(starting_nodes)
+    changed = True
+    while changed:
+        changed = False
+        loser_nodes = set()
+        winner_nodes = set()
+        for node in graph.nodes():
+            if graph.in_degree(node) <= 1:
+                continue
+            branches = []
+            has_tip = False
+            for predecessor in graph.predecessors(node):
+                chain = [predecessor]
+                seen = {predecessor, node}
+                while graph.in_degree(chain[-1]) == 1:
+                    upstream = next(iter(graph.predecessors(chain[-1])))
+                    if graph.out_degree(upstream) != 1 or upstream in seen:
+                        break
+                    chain.append(upstream)
+                    seen.add(upstream)
+                if graph.in_degree(chain[-1]) == 0 and chain[-1] in tips:
+                    has_tip = True
+                chain.reverse()
+                branches.append(chain + [node])
+            if not has_tip or len(branches) < 2:
+                continue
+            best_path = max(
+                branches,
+                key=lambda path: (_path_average_weight_cached(graph, path), len(path)),
+            )
+            winner_nodes.update(best_path)
+            for path in branches:
+                if path is not best_path:
+                    loser_nodes.update(path[:-1])
+        loser_nodes.difference_update(winner_nodes)
+        if loser_nodes:
+            graph.remove_nodes_from(loser_nodes)
+            _PATH_WEIGHT_CACHE.clear()
+            tips.update(get_starting_nodes(graph))
+            changed = True
+    return graph
 
 
 def solve_out_tips(graph: DiGraph, ending_nodes: List[str]) -> DiGraph:
@@ -361,7 +996,50 @@ def solve_out_tips(graph: DiGraph, ending_nodes: List[str]) -> DiGraph:
     :param ending_nodes: (list) A list of ending nodes
     :return: (nx.DiGraph) A directed graph object
     """
-    pass
+    # Mirror of solve_entry_tips: at each fork node the outgoing branches
+    # are walked forward along their linear chains and compete locally once
+    # one of them ends on an out tip, with removals deferred to the end of
+    # the pass.
+    tips = set(ending_nodes)
+    changed = True
+    while changed:
+        changed = False
+        loser_nodes = set()
+        winner_nodes = set()
+        for node in graph.nodes():
+            if graph.out_degree(node) <= 1:
+                continue
+            branches = []
+            has_tip = False
+            for successor in graph.successors(node):
+                chain = [successor]
+                seen = {successor, node}
+                while graph.out_degree(chain[-1]) == 1:
+                    downstream = next(iter(graph.successors(chain[-1])))
+                    if graph.in_degree(downstream) != 1 or downstream in seen:
+                        break
+                    chain.append(downstream)
+                    seen.add(downstream)
+                if graph.out_degree(chain[-1]) == 0 and chain[-1] in tips:
+                    has_tip = True
+                branches.append([node] + chain)
+            if not has_tip or len(branches) < 2:
+                continue
+            best_path = max(
+                branches,
+                key=lambda path: (_path_average_weight_cached(graph, path), len(path)),
+            )
+            winner_nodes.update(best_path)
+            for path in branches:
+                if path is not best_path:
+                    loser_nodes.update(path[1:])
+        loser_nodes.difference_update(winner_nodes)
+        if loser_nodes:
+            graph.remove_nodes_from(loser_nodes)
+            _PATH_WEIGHT_CACHE.clear()
+            tips.update(get_sink_nodes(graph))
+            changed = True
+    return graph
 
 
 def get_starting_nodes(graph: DiGraph) -> List[str]:
@@ -389,6 +1067,58 @@ def get_sink_nodes(graph: DiGraph) -> List[str]:
     pass
 
 
+class _CSRAdjacency:
+    """Compact CSR (compressed sparse row) snapshot of a DiGraph.
+
+    NetworkX stores adjacency as dict-of-dict-of-dict, costing hundreds of
+    bytes per edge and a hash lookup per neighbor. For the read-only
+    traversal phase the same topology fits in flat offset/index arrays where
+    the successors of a node are one contiguous slice. Arrays are plain
+    lists: indexing them from interpreted code is faster than per-scalar
+    NumPy access.
+    """
+
+    def __init__(self, graph: DiGraph):
+        self.nodes = list(graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n_nodes = len(self.nodes)
+        edges = [(self.index[u], self.index[v]) for u, v in graph.edges()]
+        self.indptr, self.indices = self._pack(n_nodes, edges)
+        self.rev_indptr, self.rev_indices = self._pack(
+            n_nodes, [(v, u) for u, v in edges]
+        )
+
+    @staticmethod
+    def _pack(n_nodes: int, edges: List) -> tuple:
+        """Build the offset and index arrays of one edge direction.
+
+        :param n_nodes: (int) Number of nodes.
+        :param edges: (list) Edges as (source id, target id) tuples.
+        :return: (tuple) The (indptr, indices) arrays.
+        """
+        indptr = [0] * (n_nodes + 1)
+        for source, _ in edges:
+            indptr[source + 1] += 1
+        for i in range(n_nodes):
+            indptr[i + 1] += indptr[i]
+        indices = [0] * len(edges)
+        cursor = list(indptr)
+        for source, target in edges:
+            indices[cursor[source]] = target
+            cursor[source] += 1
+        return indptr, indices
+
+    def successors(self, node_id: int) -> List[int]:
+        """Return the successor ids of a node as a contiguous slice."""
+        return self.indices[self.indptr[node_id] : self.indptr[node_id + 1]]
+
+    def predecessors(self, node_id: int) -> List[int]:
+        """Return the predecessor ids of a node as a contiguous slice."""
+        return self.rev_indices[
+            self.rev_indptr[node_id] : self.rev_indptr[node_id + 1]
+        ]
+
+
 def get_contigs(
     graph: DiGraph, starting_nodes: List[str], ending_nodes: List[str]
 ) -> List:
@@ -400,18 +1130,92 @@ def get_contigs(
     :return: (list) List of [contiguous sequence and their length]
     """
 
+    # A single iterative DFS per starting node emits every simple path that
+    # lands on an ending node, instead of one all_simple_paths enumeration
+    # (plus a has_path traversal) per (start, end) pair.
+    csr = _CSRAdjacency(graph)
+    ending_ids = {csr.index[end] for end in ending_nodes if end in csr.index}
+    # Graphs built with int_nodes carry their (k-1)-mer labels out of band.
+    labels = graph.graph.get("node_labels")
+    if labels is not None:
+        node_kmers = [labels[node] for node in csr.nodes]
+    else:
+        node_kmers = csr.nodes
+    # Last base of every node, so extending a contig by one node is a single
+    # bytearray append (amortized O(1)) instead of a str concat (O(L) each,
+    # O(L^2) over a contig).
+    last_base = [ord(kmer[-1]) for kmer in node_kmers]
     contigs = []
+
     for start in starting_nodes:
-        for end in ending_nodes:
-            if has_path(graph, start, end):
-                paths = list(all_simple_paths(graph, start, end))
-                for path in paths:
-                    contig = path[0]
-                    for node in path[1:]:
-                        contig += node[-1]
-                    contigs.append([contig, len(contig)])
+        start_id = csr.index[start]
+        contig = bytearray(node_kmers[start_id].encode())
+        path_ids = [start_id]
+        on_path = {start_id}
+        stack = [iter(csr.successors(start_id))]
+        if start_id in ending_ids:
+            contigs.append([contig.decode("ascii"), len(contig)])
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path_ids.pop())
+                del contig[-1:]
+                continue
+            if child in on_path:
+                continue
+            path_ids.append(child)
+            on_path.add(child)
+            contig.append(last_base[child])
+            if child in ending_ids:
+                contigs.append([contig.decode("ascii"), len(contig)])
+            stack.append(iter(csr.successors(child)))
     return contigs
-    pass
+
+
+def get_unitigs(graph: DiGraph) -> List:
+    """Extract the maximal unitigs from a simplified graph
+
+    Linear-time alternative to get_contigs for a graph whose bubbles and
+    tips have been resolved: every maximal branching-free chain is walked
+    exactly once from its entry node, so extraction is O(V+E) with no path
+    enumeration at all. A chain entry is a node whose in-degree differs
+    from one, or whose single predecessor forks.
+
+    :param graph: (nx.DiGraph) A directed graph object
+    :return: (list) List of [contiguous sequence and their length]
+    """
+    csr = _CSRAdjacency(graph)
+    labels = graph.graph.get("node_labels")
+    if labels is not None:
+        node_kmers = [labels[node] for node in csr.nodes]
+    else:
+        node_kmers = csr.nodes
+    last_base = [ord(kmer[-1]) for kmer in node_kmers]
+
+    def in_degree(node_id: int) -> int:
+        return csr.rev_indptr[node_id + 1] - csr.rev_indptr[node_id]
+
+    def out_degree(node_id: int) -> int:
+        return csr.indptr[node_id + 1] - csr.indptr[node_id]
+
+    unitigs = []
+    for node_id in range(len(csr.nodes)):
+        if in_degree(node_id) == 1:
+            predecessor = csr.predecessors(node_id)[0]
+            if out_degree(predecessor) == 1:
+                # Interior node of a chain, reached from its entry.
+                continue
+        contig = bytearray(node_kmers[node_id].encode())
+        current = node_id
+        while out_degree(current) == 1:
+            successor = csr.successors(current)[0]
+            if in_degree(successor) != 1:
+                break
+            contig.append(last_base[successor])
+            current = successor
+        unitigs.append([contig.decode("ascii"), len(contig)])
+    return unitigs
 
 
 def save_contigs(contigs_list: List[str], output_file: Path) -> None:
@@ -421,10 +1225,18 @@ def save_contigs(contigs_list: List[str], output_file: Path) -> None:
     :param output_file: (Path) Path to the output file
     """
 
-    with open(output_file, 'w') as f:
-        for i, (contig, length) in enumerate(contigs_list):
-            f.write(f">contig_{i} len={length}\n{contig}\n")
-    pass
+    # Assemble the whole output in memory and issue one write: a single
+    # buffered syscall instead of one write call per contig. Sequences are
+    # wrapped at the standard 80 columns of the fasta format.
+    parts = []
+    for i, (contig, length) in enumerate(contigs_list):
+        parts.append(f">contig_{i} len={length}\n".encode())
+        encoded = contig.encode()
+        for j in range(0, length, 80):
+            parts.append(encoded[j : j + 80])
+            parts.append(b"\n")
+    with open(output_file, "wb") as file:
+        file.write(b"".join(parts))
 
 
 def draw_graph(graph: DiGraph, graphimg_file: Path) -> None:  # pragma: no cover
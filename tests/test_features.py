@@ -0,0 +1,80 @@
+"""Tests for the optional counting and assembly features"""
+import networkx as nx
+from pathlib import Path
+from .context import debruijn
+from debruijn import build_kmer_dict
+from debruijn import build_graph
+from debruijn import get_contigs
+from debruijn import get_unitigs
+from debruijn import get_starting_nodes
+from debruijn import get_sink_nodes
+
+
+def test_build_kmer_dict_parallel():
+    """Parallel chunked counting matches the serial counts"""
+    fastq = Path(__file__).parent / "test_two_reads.fq"
+    assert build_kmer_dict(fastq, 5, processes=2) == build_kmer_dict(fastq, 5)
+
+
+def test_build_kmer_dict_canonical():
+    """Canonical counting folds each kmer with its reverse complement"""
+    fastq = Path(__file__).parent / "test_build.fq"
+    # TCAGAGA: GAG folds onto its reverse complement CTC, the other kmers
+    # are already the smaller of the pair.
+    assert build_kmer_dict(fastq, 3, canonical=True) == {
+        "TCA": 1,
+        "CAG": 1,
+        "AGA": 2,
+        "CTC": 1,
+    }
+
+
+def test_build_kmer_dict_drop_singletons():
+    """The Bloom pre-pass drops singletons and keeps exact counts"""
+    fastq = Path(__file__).parent / "test_build.fq"
+    assert build_kmer_dict(fastq, 3, drop_singletons=True) == {"AGA": 2}
+
+
+def test_build_graph_int_nodes():
+    """Int-node graphs assemble the same contigs as string-node graphs"""
+    kmer_dict = build_kmer_dict(Path(__file__).parent / "test_two_reads.fq", 22)
+    graph_str = build_graph(kmer_dict)
+    graph_int = build_graph(kmer_dict, int_nodes=True)
+    assert graph_int.number_of_nodes() == graph_str.number_of_nodes()
+    assert graph_int.number_of_edges() == graph_str.number_of_edges()
+    contigs_str = get_contigs(
+        graph_str, get_starting_nodes(graph_str), get_sink_nodes(graph_str)
+    )
+    contigs_int = get_contigs(
+        graph_int, get_starting_nodes(graph_int), get_sink_nodes(graph_int)
+    )
+    assert sorted(map(tuple, contigs_int)) == sorted(map(tuple, contigs_str))
+
+
+def test_get_unitigs():
+    """Unitig extraction matches get_contigs on a branching-free graph"""
+    graph = nx.DiGraph()
+    graph.add_edges_from([("TC", "CA"), ("CA", "AG"), ("AG", "GC")])
+    assert get_unitigs(graph) == [["TCAGC", 5]]
+    assert get_contigs(graph, ["TC"], ["GC"]) == [["TCAGC", 5]]
+    # Chains are cut at branch points
+    branched = nx.DiGraph()
+    branched.add_edges_from(
+        [
+            ("TC", "CA"),
+            ("AC", "CA"),
+            ("CA", "AG"),
+            ("AG", "GC"),
+            ("GC", "CG"),
+            ("CG", "GA"),
+            ("GA", "AT"),
+            ("GA", "AA"),
+        ]
+    )
+    assert sorted(get_unitigs(branched)) == [
+        ["AA", 2],
+        ["AC", 2],
+        ["AT", 2],
+        ["CAGCGA", 6],
+        ["TC", 2],
+    ]